@@ -23,14 +23,33 @@ Example: If you ask "My child won't clean up their toys", it will:
 # Think of imports like gathering ingredients before cooking
 
 import os  # This helps us work with files and folders on the computer
-from typing import List, Dict, Any  # This helps us organize our data neatly
+import sys  # Lets us print AI words to the screen the moment they arrive
+import asyncio  # Lets the program wait for the AI without freezing everything else
+from concurrent.futures import ThreadPoolExecutor  # Runs slow jobs at the same time
+import hashlib  # Makes short "fingerprints" of text so we can recognise it later
+import json  # Writes Python data as text (used to measure tool descriptions)
+import shelve  # Saves Python objects to a file (used to remember past answers)
+import functools  # Helpers for functions, like remembering results we already computed
+import itertools  # Helpers for walking through sequences of items
+import threading  # Makes sure two jobs don't load the embedding model at once
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple  # Organizing our data
+
+import numpy as np  # Fast math on big tables of numbers (used to compare meanings)
+import faiss  # Fast "find the most similar" index for embeddings
+import diskcache  # A simple cache that lives in a folder on disk
+from sentence_transformers import SentenceTransformer  # Turns text into "meaning numbers"
+from prompt_toolkit import PromptSession  # Reads what the user types without blocking
 
 # LangChain tools - These are like building blocks for our AI agent
-from langchain.agents import AgentExecutor, create_react_agent  # The brain of our agent
+from langchain.agents import AgentExecutor, create_tool_calling_agent  # The brain of our agent
 from langchain_core.tools import Tool  # Lets us create custom abilities for the agent
-from langchain_community.llms import Ollama  # Connects to the qwen3 AI model
+from langchain_core.callbacks import CallbackManagerForToolRun  # Tool progress reporting
+from langchain_ollama import ChatOllama  # Connects to the qwen3 AI model (chat + tool calls)
 from langchain_community.tools import DuckDuckGoSearchRun  # Internet search ability
-from langchain_core.prompts import PromptTemplate  # Instructions template for the AI
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder  # Instructions for the AI
+from langchain_core.prompt_values import PromptValue  # A prompt that's ready to send
+from langchain_core.utils.function_calling import convert_to_openai_tool  # Tool -> JSON schema
+from langchain_core.runnables import Runnable, RunnableLambda  # Chainable steps for the agent
 
 
 # =============================================================================
@@ -39,7 +58,9 @@ from langchain_core.prompts import PromptTemplate  # Instructions template for t
 # These are the main settings we can change if needed
 
 # Name of the AI model we're using (must be already installed in Ollama)
-MODEL_NAME = "qwen3:8b"  
+# q4_K_M = the model's numbers are squeezed to about 4 bits each (quantized),
+# so it needs roughly a quarter of the memory and answers faster
+MODEL_NAME = "qwen3:8b-q4_K_M"
 
 # Path to the book summary file (where our parenting wisdom lives)
 BOOK_SUMMARY_PATH = "book_summary.txt"
@@ -49,46 +70,349 @@ BOOK_SUMMARY_PATH = "book_summary.txt"
 # Think of it like: 0 = robot (same answer every time), 1 = artist (very creative)
 TEMPERATURE = 0.3
 
+# Smallest and largest context window (in tokens) we'll ask the AI for
+# The actual size is picked from the prompts we send - see ContextSizedLLM
+MIN_NUM_CTX = 1024
+MAX_NUM_CTX = 8192
+
+# Rough number of text characters per token, used to estimate prompt length
+CHARS_PER_TOKEN = 3
+
+# Tokens of room left in the context window for the AI's own reply
+REPLY_TOKEN_BUDGET = 512
+
+# Small local model that turns text into "meaning fingerprints" (embeddings)
+# Two texts about the same idea get similar fingerprints, even with different words
+EMBEDDING_MODEL_NAME = "BAAI/bge-small-en"
+
+# How many book passages to give the AI for each question
+# Fewer passages = shorter prompt = faster answers
+TOP_K_PASSAGES = 4
+
+# Folder where the searchable book index is saved between runs
+# If the book hasn't changed, the next start loads it instead of rebuilding it
+INDEX_STORE_DIR = "./faiss_store"
+
+# How many neighbours each passage links to in the search graph (HNSW)
+# More links = slightly more accurate search, but more memory
+HNSW_NEIGHBORS = 32
+
+# How many passages the embedding model reads in one go when building the index
+# Reading many at once is much faster than reading them one by one
+EMBEDDING_BATCH_SIZE = 64
+
+# File where previous answers are remembered between runs
+SEMANTIC_CACHE_PATH = ".semantic_cache"
+
+# How similar (0 to 1) a new question must be to an old one to reuse its answer
+# 0.93 means "practically the same question, just worded differently"
+SEMANTIC_CACHE_THRESHOLD = 0.93
+
+# Reusing answers is only safe when the model gives consistent answers anyway
+# Above this temperature every answer is meant to be a bit different, so no cache
+SEMANTIC_CACHE_MAX_TEMPERATURE = 0.4
+
+# Folder where web search results are saved
+# Searching for the same thing again uses the saved result instead of the internet
+SEARCH_CACHE_DIR = "./.search_cache"
+
+# How long (in seconds) a saved search result stays fresh - 24 hours
+SEARCH_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# How many different tool lookups to remember while answering one question
+# The agent sometimes asks a tool the same thing twice - the repeat is free
+TOOL_CACHE_SIZE = 32
+
 
 # =============================================================================
 # KNOWLEDGE BASE LOADER - Reading the Book Summary
 # =============================================================================
-def load_book_summary(file_path: str) -> str:
+def is_markdown_heading(line: str) -> bool:
+    """
+    Check whether a line is a Markdown heading like "## Chapter 3".
+    
+    This is a plain character check (1 to 6 "#" signs, then a space) rather
+    than a regular expression, so it costs next to nothing per line.
+    
+    Parameters:
+    - line: One line of the book
+    
+    Returns:
+    - True if the line starts a new Markdown section
+    """
+    text = line.lstrip("#")
+    return 1 <= len(line) - len(text) <= 6 and text.startswith(" ")
+
+
+def chunk_stream(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Group lines of text into passages that can be searched separately.
+    
+    What this does (simple explanation):
+    Paragraphs are separated by blank lines. We collect lines until we reach
+    a blank line, and then hand back the finished paragraph. Short one-line
+    paragraphs are headings (like "Chapter 7: Cleanup Time"), so we glue them
+    onto the paragraph that follows instead of keeping them on their own.
+    That way each passage carries its chapter title along with its advice.
+    
+    Markdown headings ("# ...") always start a new passage, even without a
+    blank line in front of them. Inside a Markdown section every paragraph is
+    kept as text, even a one-line one - the "# ..." line is already the
+    heading, so there is nothing to guess.
+    
+    Lines are handled one at a time, in a single pass, with simple string
+    checks and no regular expressions. We never need the whole book in
+    memory as one big piece of text - only the paragraph being built.
+    
+    Parameters:
+    - lines: The lines of the book (an open file works directly)
+    
+    Yields:
+    - Passages, each one a chapter title plus its bullet points
+    
+    Example:
+    "Chapter 8: Shyness", "", "* Acknowledge nervous feelings." becomes the
+    single passage "Chapter 8: Shyness\n* Acknowledge nervous feelings."
+    """
+    headings: List[str] = []  # Headings waiting to be attached to the next paragraph
+    paragraph: List[str] = []  # Lines of the paragraph being collected
+    in_markdown_section = False  # Set once the first "# ..." heading is seen
+    
+    # The extra "" at the end acts as a final blank line to finish the last paragraph
+    for line in itertools.chain(lines, [""]):
+        markdown_heading = is_markdown_heading(line)
+        if line.strip() and not markdown_heading:
+            paragraph.append(line.rstrip())
+            continue
+        
+        # A blank line or a Markdown heading ends the paragraph being collected
+        if paragraph:
+            if (not markdown_heading and not in_markdown_section
+                    and len(paragraph) == 1 and not paragraph[0].lstrip().startswith("*")):
+                # A single line that isn't a bullet point is a heading
+                # (only for plain-text books - Markdown marks its headings with "#")
+                headings.append(paragraph[0].strip())
+            else:
+                yield "\n".join(headings + paragraph)
+                headings = []
+            paragraph = []
+        
+        if markdown_heading:
+            headings.append(line.strip())
+            in_markdown_section = True
+    
+    if headings:
+        # Keep any trailing headings so no text is lost
+        yield "\n".join(headings)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_book_file(abs_path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """
+    Read a file from disk into passages, remembering the result.
+    
+    The modification time and size are not used for reading - they are part of
+    the memory key. If the file is edited, its time or size changes, the key no
+    longer matches, and the file is read again. An unchanged file is only ever
+    read once per run.
+    """
+    # 'r' means "read mode" - like opening a book to read, not write
+    # 'utf-8' means the file uses standard letters and symbols
+    # The file is read line by line straight into passages - only the
+    # finished passages are kept, never a full copy of the whole file
+    with open(abs_path, 'r', encoding='utf-8') as file:
+        return tuple(chunk_stream(file))
+
+
+def load_book_summary(file_path: str) -> List[str]:
     """
     This function reads the parenting book summary from a file.
     
     What it does (explained like to a 5-year-old):
-    Imagine you have a recipe card. This function opens that card and reads
-    all the instructions so we can use them later.
+    Imagine you have a recipe card. This function opens that card, reads
+    all the instructions, and cuts them into small cards (passages), one
+    for each topic, so we can use them later.
     
     Parameters:
     - file_path: The location of the file (like an address: "123 Main Street")
     
     Returns:
-    - The text inside the file (all the parenting advice)
+    - The passages of the file (all the parenting advice, topic by topic)
     
     Example:
-    If the file contains "Always acknowledge feelings", this function will
-    give us that text back so our AI can use it.
+    If the file contains "Chapter 1: Handling Big Emotions" followed by
+    "* Acknowledge feelings", this function gives us that chapter back as
+    one passage so our AI can use it.
+    
+    Loading the same unchanged file again is free: the passages are
+    remembered and only re-read when the file on disk changes.
     """
     try:
-        # Try to open and read the file
-        # 'r' means "read mode" - like opening a book to read, not write
-        # 'utf-8' means the file uses standard letters and symbols
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()  # Read everything in the file
-            return content  # Give back what we read
+        # Look at the file's details without reading it
+        # (where it is, when it was last changed, how big it is)
+        stat = os.stat(file_path)
+        return list(_read_book_file(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size))
     except FileNotFoundError:
         # If the file doesn't exist, show an error message
         # This is like looking for a book that's not on the shelf
         print(f"Error: Book summary file not found at {file_path}")
         print("Please ensure book_summary.txt is in the same folder as this script.")
-        return ""  # Return empty text so the program doesn't crash
+        return []  # Return no passages so the program doesn't crash
     except Exception as e:
         # If something else goes wrong, show what happened
         # This catches any unexpected problems
         print(f"Error reading book summary: {str(e)}")
-        return ""
+        return []
+
+
+# =============================================================================
+# EMBEDDING MODEL - Turning Text Into Comparable Numbers
+# =============================================================================
+# The embedding model is loaded once and shared by everything that needs it.
+# Loading it takes a few seconds, so we never want to do that twice.
+_EMBEDDER = None
+_EMBEDDER_LOCK = threading.Lock()
+
+# Book index cache: book passages -> search index
+# Building the index means running every passage through the embedding model,
+# so we remember the result and reuse it if the same book is indexed again.
+_BOOK_INDEX_CACHE: Dict[Tuple[str, ...], faiss.Index] = {}
+
+
+def get_embedder() -> SentenceTransformer:
+    """
+    Return the shared embedding model, loading it the first time it's needed.
+    
+    What this does (simple explanation):
+    The embedding model reads a piece of text and turns it into a list of
+    numbers that describes its meaning. Texts with similar meanings get
+    similar numbers, which lets us find the right book passage for a question.
+    
+    Returns:
+    - The loaded SentenceTransformer model
+    """
+    global _EMBEDDER
+    # Startup jobs run side by side and may all ask for the model at once,
+    # so only one of them loads it while the others wait for that copy
+    with _EMBEDDER_LOCK:
+        if _EMBEDDER is None:
+            _EMBEDDER = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    return _EMBEDDER
+
+
+def embed_query(query: str) -> np.ndarray:
+    """
+    Turn one question into its normalized "meaning fingerprint".
+    
+    Parameters:
+    - query: The question (or search text) to embed
+    
+    Returns:
+    - A 1-D float32 embedding vector
+    """
+    embedding = get_embedder().encode([query], normalize_embeddings=True)
+    return np.ascontiguousarray(embedding, dtype=np.float32)[0]
+
+
+def book_fingerprint(passages: List[str]) -> str:
+    """
+    Make a short fingerprint of the book passages and how they are indexed.
+    
+    What this does (simple explanation):
+    The same passages, embedded by the same model into the same kind of
+    index, always give the same fingerprint. Change any of those - edit the
+    book, pick another embedding model - and the fingerprint changes, so
+    anything saved for the old book can be recognised as out of date.
+    
+    Parameters:
+    - passages: The book's passages, as returned by load_book_summary()
+    
+    Returns:
+    - A 16-character fingerprint
+    """
+    hasher = hashlib.sha256(f"{EMBEDDING_MODEL_NAME}\nhnsw-sq8\n".encode("utf-8"))
+    for passage in passages:
+        hasher.update(passage.encode("utf-8"))
+        hasher.update(b"\0")  # Separator, so passage boundaries count too
+    return hasher.hexdigest()[:16]
+
+
+def build_book_index(passages: List[str]) -> faiss.Index:
+    """
+    Build a search index over the embeddings of the book's passages.
+    
+    What this does (simple explanation):
+    This is like writing an index card for every section of the book. Each
+    card gets a "meaning fingerprint" (stored compactly as 8-bit numbers),
+    and the cards are arranged in a graph (HNSW) where similar cards sit next
+    to each other. Finding the best cards for a question then means walking
+    a few steps through the graph instead of comparing the question with
+    every single card.
+    
+    The finished index is saved in INDEX_STORE_DIR. The file name contains a
+    fingerprint of the passages, so an edited book gets a fresh index while
+    an unchanged book is simply loaded from disk on the next start.
+    
+    The passages and their embeddings are kept side by side as plain arrays:
+    passages[i] is the text for row i of the embedding matrix, which is also
+    id i in the index. There is no list of {"text": ..., "embedding": ...}
+    dictionaries - one solid block of numbers is what the index (and the
+    CPU's fast math routines) can read in a single sweep.
+    
+    Parameters:
+    - passages: The book's passages, as returned by load_book_summary()
+    
+    Returns:
+    - The search index (index ids = passage positions)
+    """
+    key = tuple(passages)
+    if key in _BOOK_INDEX_CACHE:
+        return _BOOK_INDEX_CACHE[key]
+    
+    # Same passages + same embedding model + same index type = same index,
+    # so it can be reused
+    index_path = os.path.join(INDEX_STORE_DIR, f"book-{book_fingerprint(passages)}.faiss")
+    
+    index = None
+    if os.path.exists(index_path):
+        # Saved index found - skip the embedding step entirely
+        index = faiss.read_index(index_path)
+        if index.ntotal != len(passages):
+            index = None  # Passages were split differently - rebuild it
+    
+    if index is None:
+        # One call embeds every passage, EMBEDDING_BATCH_SIZE at a time
+        # (never loop over passages one by one - batches use the model far better)
+        # The model already sorts passages by length before batching, so each
+        # batch holds similar-sized texts and little work is wasted on padding
+        # normalize_embeddings=True makes inner product equal cosine similarity
+        embeddings = get_embedder().encode(
+            passages,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        # One solid, row-by-row float32 block - exactly the layout FAISS reads
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        
+        # Store each number as a small 8-bit integer instead of a 32-bit float
+        # (scalar quantization). The index takes a quarter of the memory and
+        # comparisons run on fast integer math; the best passages barely change.
+        index = faiss.IndexHNSWSQ(
+            embeddings.shape[1],
+            faiss.ScalarQuantizer.QT_8bit,
+            HNSW_NEIGHBORS,
+            faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(embeddings)  # Learn each dimension's range for the 8-bit scale
+        index.add(embeddings)  # Passage i gets id i
+        
+        os.makedirs(INDEX_STORE_DIR, exist_ok=True)
+        faiss.write_index(index, index_path)
+    
+    _BOOK_INDEX_CACHE[key] = index
+    return index
 
 
 # =============================================================================
@@ -107,57 +431,70 @@ class BookKnowledgeTool:
     name emotions, allow space for expression"
     """
     
-    def __init__(self, book_content: str):
+    def __init__(self, passages: List[str]):
         """
-        Set up the tool with the book content.
+        Set up the tool with the book's passages.
         
         What this does:
-        When we create this tool, we give it the entire book summary to remember.
-        It's like giving someone a textbook and saying "memorize this for the test".
+        When we create this tool, we give each passage of the book summary a
+        "meaning fingerprint" (embedding). Later, questions are matched
+        against these fingerprints to find the relevant passages.
         
         Parameters:
-        - book_content: All the text from the book summary file
+        - passages: The book summary, cut into passages by load_book_summary()
         """
-        # Store the book content so we can use it later
-        # Think of this like putting the recipe in your pocket
-        self.book_content = book_content
+        # Store the passages so we can use them later
+        # Think of this like putting the recipe cards in your pocket
+        self.passages = passages
+        
+        # Build (or load) the searchable index of passages
+        self.index = build_book_index(passages) if passages else None
     
     def search(self, query: str) -> str:
         """
         Search the book content for relevant information.
         
         What this does (explained simply):
-        When someone asks a question, this function looks through the book
-        and returns the entire summary. The AI will then read through it
-        to find the relevant parts.
+        When someone asks a question, this function turns the question into
+        a "meaning fingerprint" and asks the index for the passages with the
+        closest fingerprints. Only those few passages are returned.
         
-        Why return everything?
-        The book summary is short enough that the AI can read all of it
-        quickly. This is simpler than building a complex search system.
-        It's like reading a 2-page cheat sheet instead of searching a
-        1000-page encyclopedia.
+        Why not return everything?
+        Every word we hand the AI has to be read again on every step of its
+        thinking. Sending only the matching passages keeps the prompt short,
+        so answers come back faster and use less memory.
         
         Parameters:
         - query: The question being asked (e.g., "How to handle lying?")
         
         Returns:
-        - The relevant book content (or the whole summary if it's short)
+        - The most relevant passages from the book
         
         Example:
         Input: "My child won't cooperate"
-        Output: The entire book summary, which includes Chapter 2 about
-                "Engaging Cooperation"
+        Output: The passages about Chapter 2 "Engaging Cooperation" and
+                other closely related advice
         """
-        if not self.book_content:
+        if not self.passages:
             # If the book is empty, we can't help
             return "Book summary not loaded. Cannot provide guidance."
         
-        # Return the entire book summary wrapped in a clear format
+        # Turn the question into a fingerprint just like the passages
+        query_embedding = embed_query(query)
+        
+        # Walk the index graph to the closest passages (best match first)
+        k = min(TOP_K_PASSAGES, len(self.passages))
+        _, ids = self.index.search(query_embedding[None, :], k)
+        
+        # The index answers with passage positions (-1 means "no match")
+        relevant_passages = "\n\n".join(self.passages[i] for i in ids[0] if i >= 0)
+        
+        # Return the matching passages wrapped in a clear format
         # The triple quotes create a multi-line string
         return f"""
 Parenting Guidance from "How to Talk So Little Kids Will Listen":
 
-{self.book_content}
+{relevant_passages}
 
 This guidance addresses common parenting situations using research-backed
 communication techniques. Apply these principles to your specific situation.
@@ -167,7 +504,7 @@ communication techniques. Apply these principles to your specific situation.
 # =============================================================================
 # INITIALIZE LLM - Setting Up the AI Brain
 # =============================================================================
-def initialize_llm() -> Ollama:
+def initialize_llm(num_ctx: int) -> ChatOllama:
     """
     Create and configure the AI language model.
     
@@ -176,30 +513,386 @@ def initialize_llm() -> Ollama:
     like turning on a very smart calculator that can understand and answer
     questions in human language.
     
+    Parameters:
+    - num_ctx: How much text (in tokens) it can remember at once
+               (picked per prompt by ContextSizedLLM)
+    
     Returns:
-    - A configured Ollama model ready to answer questions
+    - A configured ChatOllama model ready to answer questions
     
     Important settings explained:
     - model: Which AI brain to use (qwen2.5:3b - a small but smart model)
     - temperature: How creative vs. consistent (0.3 = mostly consistent)
-    - num_ctx: How much text it can remember at once (4096 words is plenty)
+    - num_ctx: How much text it can remember at once (bigger = more memory)
+    - num_gpu: How many model layers go on the graphics card (-1 = as many as fit)
+    - num_thread: How many CPU cores to use (all but one, so the computer stays usable)
+    - repeat_penalty: Gently discourages the AI from repeating itself
+    - keep_alive: Keep the model loaded between questions instead of reloading it
     
     Example:
     This is like opening a textbook and getting ready to study. The AI is
     now ready to read our questions and the book summary.
     """
-    llm = Ollama(
+    llm = ChatOllama(
         model=MODEL_NAME,  # Use the qwen2.5:3b model
         temperature=TEMPERATURE,  # Control creativity level
-        num_ctx=4096  # How many words it can process at once (context window)
+        num_ctx=num_ctx,  # How many tokens it can process at once (context window)
+        num_gpu=-1,  # Let Ollama offload as many layers to the GPU as fit
+        num_thread=max(1, (os.cpu_count() or 4) - 1),  # Leave one core free
+        repeat_penalty=1.05,  # Mild nudge away from repeated phrases
+        keep_alive="30m"  # Stay loaded for 30 minutes after the last question
     )
     return llm
 
 
+def context_window_for(prompt_text: str) -> int:
+    """
+    Pick a context window size that comfortably fits a prompt.
+    
+    What this does (simple explanation):
+    Ollama reserves memory for every token the context window *could* hold,
+    even if the prompt is much shorter. So instead of always asking for a
+    big window, we estimate how long the prompt is and round up to the next
+    power of two (1024, 2048, 4096, ...), leaving room for the AI's reply.
+    
+    Parameters:
+    - prompt_text: The full text about to be sent to the AI
+    
+    Returns:
+    - The context window size (in tokens) to use for this prompt
+    
+    Example:
+    A 2,400-character prompt is roughly 800 tokens. With 512 tokens of room
+    for the reply that's 1,312 tokens, so we ask for a 2048-token window.
+    """
+    # Rough token count - English text averages 3-4 characters per token,
+    # so dividing by CHARS_PER_TOKEN errs on the side of a bigger window
+    estimated_tokens = len(prompt_text) // CHARS_PER_TOKEN + REPLY_TOKEN_BUDGET
+    num_ctx = 1 << max(MIN_NUM_CTX.bit_length() - 1, estimated_tokens.bit_length())
+    return min(num_ctx, MAX_NUM_CTX)
+
+
+def tools_schema_text(tools: List[Tool]) -> str:
+    """
+    Write out the tool descriptions the way they are sent to the AI.
+    
+    Ollama receives these descriptions (as JSON) with every prompt, so they
+    take up room in the context window just like the prompt itself.
+    
+    Parameters:
+    - tools: The tools the model may call
+    
+    Returns:
+    - The tool descriptions as JSON text
+    """
+    return json.dumps([convert_to_openai_tool(tool) for tool in tools])
+
+
+class ContextSizedLLM:
+    """
+    A small pool of AI models that only differ in their context window size.
+    
+    Think of this like a set of notebooks in different sizes. We start with
+    the small notebook; only when the notes get too long do we switch to a
+    bigger one - and then we keep using the bigger one, even for short
+    questions. Each notebook is created the first time it's needed.
+    
+    Every prompt is measured with context_window_for(). The window only ever
+    grows during a session, never shrinks: Ollama has to reload the model
+    (and forget the start of the prompt it had already processed) whenever
+    the window size changes, so switching back and forth between sizes
+    would cost far more than the memory a larger window uses.
+    
+    The agent treats this like a normal chat model - it only ever calls
+    bind_tools() to tell the model which tools it may use.
+    """
+    
+    def __init__(self):
+        # Context window size -> ChatOllama model with that window
+        self._pool: Dict[int, ChatOllama] = {}
+        
+        # The largest window used so far in this session
+        self._num_ctx = MIN_NUM_CTX
+    
+    def fit(self, prompt_text: str) -> int:
+        """
+        Pick the context window for a prompt, growing the current one if needed.
+        
+        Parameters:
+        - prompt_text: Everything about to be sent to the AI
+        
+        Returns:
+        - The window size to use: the current one, or a bigger one if the
+          prompt doesn't fit (it never shrinks back)
+        """
+        self._num_ctx = max(self._num_ctx, context_window_for(prompt_text))
+        return self._num_ctx
+    
+    def get(self, num_ctx: int) -> ChatOllama:
+        """
+        Return the model with the given context window, creating it if needed.
+        
+        Parameters:
+        - num_ctx: The context window size (in tokens)
+        
+        Returns:
+        - A ChatOllama model configured with that window size
+        """
+        if num_ctx not in self._pool:
+            self._pool[num_ctx] = initialize_llm(num_ctx)
+        return self._pool[num_ctx]
+    
+    def bind_tools(self, tools: List[Tool]) -> Runnable:
+        """
+        Work like ChatOllama.bind_tools(): let the model call these tools.
+        
+        The tool descriptions are sent to Ollama along with every prompt, so
+        they count toward the prompt size when picking the context window.
+        
+        Parameters:
+        - tools: The tools the model may call
+        
+        Returns:
+        - A runnable that picks the right-sized model for each prompt
+        """
+        tools_text = tools_schema_text(tools)
+        with_tools: Dict[int, Runnable] = {}  # Window size -> model with tools attached
+        
+        def route(prompt: PromptValue) -> Runnable:
+            # Hand the prompt to the model whose window fits it
+            num_ctx = self.fit(prompt.to_string() + tools_text)
+            if num_ctx not in with_tools:
+                with_tools[num_ctx] = self.get(num_ctx).bind_tools(tools)
+            return with_tools[num_ctx]
+        
+        return RunnableLambda(route)
+
+
+def warm_up_llm(llm: ContextSizedLLM, tools: List[Tool]) -> None:
+    """
+    Make Ollama load the model now, so the first real question is fast.
+    
+    What this does (simple explanation):
+    The very first request to Ollama has to load several gigabytes of model
+    into memory, which can take a while. We send a tiny throwaway request at
+    startup so that waiting happens while everything else is loading too.
+    
+    The throwaway request only asks for a single token.
+    
+    Ollama reloads the model whenever the context window size changes, so
+    the warm-up has to use the same window as the first real question. We
+    measure a typical question exactly like the agent will (full prompt plus
+    tool descriptions, see ContextSizedLLM.fit) and warm up with that size.
+    
+    Parameters:
+    - llm: The model pool the agent will use
+    - tools: The tools the agent will be given (the stand-ins from
+             describe_tools() work too - only names and descriptions count)
+    """
+    sample_prompt = AGENT_PROMPT.format_prompt(
+        input="My 4-year-old won't clean up their toys. What should I do?",
+        agent_scratchpad=[]
+    )
+    num_ctx = llm.fit(sample_prompt.to_string() + tools_schema_text(tools))
+    try:
+        warm_up = llm.get(num_ctx).model_copy(update={"num_predict": 1})
+        warm_up.invoke("ok")
+    except Exception as e:
+        # Not fatal - the first question will just be slower (or show the error)
+        print(f"Warning: could not warm up the AI model ({str(e)}).")
+
+
+# =============================================================================
+# CACHED WEB SEARCH - Remembering Internet Searches
+# =============================================================================
+# The search cache is opened once and shared, just like the embedding model.
+_SEARCH_CACHE = None
+
+
+def get_search_cache() -> diskcache.Cache:
+    """
+    Return the shared on-disk search cache, opening it the first time.
+    
+    Returns:
+    - The diskcache.Cache stored in SEARCH_CACHE_DIR
+    """
+    global _SEARCH_CACHE
+    if _SEARCH_CACHE is None:
+        _SEARCH_CACHE = diskcache.Cache(SEARCH_CACHE_DIR)
+    return _SEARCH_CACHE
+
+
+def search_cache_key(query: str) -> str:
+    """
+    Turn a search query into a short, tidy cache key.
+    
+    What this does (simple explanation):
+    "Toddler  Sleep Tips" and "toddler sleep tips " are the same search, so
+    we lowercase the query and squash extra spaces before making a
+    fingerprint of it. That way small typing differences still find the
+    saved result.
+    
+    Parameters:
+    - query: The search text the agent asked for
+    
+    Returns:
+    - A fixed-length fingerprint of the tidied-up query
+    """
+    normalized = " ".join(query.lower().split())
+    return hashlib.blake2b(normalized.encode("utf-8")).hexdigest()
+
+
+class CachedDuckDuckGoSearchRun(DuckDuckGoSearchRun):
+    """
+    DuckDuckGo search that remembers its results on disk.
+    
+    Think of this like writing down what you found the last time you looked
+    something up. If the agent searches for the same thing again (even after
+    a restart), the saved result is used instead of going back to the
+    internet. Saved results expire after SEARCH_CACHE_TTL_SECONDS so advice
+    doesn't get stale.
+    """
+    
+    def _run(self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+        """
+        Return the saved result for this query, or search and save it.
+        
+        Parameters:
+        - query: What to search for
+        - run_manager: LangChain's callback helper (passed through unchanged)
+        
+        Returns:
+        - The search results as text
+        """
+        cache = get_search_cache()
+        key = search_cache_key(query)
+        
+        result = cache.get(key)
+        if result is None:
+            # Not searched recently - ask DuckDuckGo and remember the answer
+            result = super()._run(query, run_manager=run_manager)
+            cache.set(key, result, expire=SEARCH_CACHE_TTL_SECONDS)
+        return result
+
+
 # =============================================================================
 # CREATE TOOLS - Building the Agent's Abilities
 # =============================================================================
-def create_tools(book_content: str) -> List[Tool]:
+class ObservationDeduplicator:
+    """
+    Replaces repeated tool results with a short note while answering one question.
+    
+    Think of this like a student taking notes. If they look something up and
+    get exactly the same page as before, they don't copy the whole page into
+    their notes again - they write "same as when I looked up tantrums".
+    
+    Every tool result ends up in the agent's notes (its scratchpad), and the
+    whole scratchpad is sent to the AI again on every thinking step. Without
+    this, a repeated lookup would put the same long text into the prompt
+    twice, then three times, making every step slower than the last.
+    
+    Tool results reach the AI without numbers, so the note names the earlier
+    lookup by its tool and input - that's what the AI can see in its notes.
+    
+    Example:
+    book_knowledge("cleaning up toys") returns the Chapter 7 passages.
+    book_knowledge("tidying the bedroom") returns the very same passages.
+    The agent's notes get the passages once, then:
+    '(Same result as the earlier book_knowledge lookup for "cleaning up toys" -
+    see that result above.)'
+    """
+    
+    def __init__(self):
+        """Start with no results seen."""
+        # Result fingerprint -> (tool name, tool input) of the first lookup
+        self._seen: Dict[str, Tuple[str, str]] = {}
+        # The agent may run several tool calls at once on different threads,
+        # so checking and recording a result happens one call at a time
+        self._lock = threading.Lock()
+    
+    def reset(self) -> None:
+        """Forget everything - called before each new question."""
+        with self._lock:
+            self._seen.clear()
+    
+    def wrap(self, tool_name: str, func: Callable[[str], str]) -> Callable[[str], str]:
+        """
+        Wrap a tool function so its repeated results are replaced by a note.
+        
+        The wrapped function also gets a cache_clear() that resets this
+        deduplicator and the function's own cache, so clear_tool_caches()
+        resets both at the start of a question.
+        
+        Parameters:
+        - tool_name: The tool's name, as the AI knows it
+        - func: The tool function (takes the tool input, returns text)
+        
+        Returns:
+        - The wrapped tool function
+        """
+        @functools.wraps(func)
+        def deduplicated(query: str) -> str:
+            result = func(query)
+            
+            fingerprint = hashlib.blake2b(result.encode("utf-8")).hexdigest()
+            with self._lock:
+                first_lookup = self._seen.get(fingerprint)
+                if first_lookup is None:
+                    self._seen[fingerprint] = (tool_name, query)
+            
+            if first_lookup is not None:
+                first_tool, first_query = first_lookup
+                return (f'(Same result as the earlier {first_tool} lookup for "{first_query}" - '
+                        f'see that result above.)')
+            return result
+        
+        inner_cache_clear = getattr(func, "cache_clear", None)
+        
+        def cache_clear() -> None:
+            self.reset()
+            if inner_cache_clear is not None:
+                inner_cache_clear()
+        
+        deduplicated.cache_clear = cache_clear
+        return deduplicated
+
+
+# What the AI is told about each tool: tool name -> description
+# Kept in one place so the descriptions can be measured before the tools
+# themselves are built (see describe_tools)
+TOOL_DESCRIPTIONS: Dict[str, str] = {
+    "book_knowledge": """Use this tool FIRST for parenting questions. Contains expert advice 
+    from 'How to Talk So Little Kids Will Listen' covering: handling emotions, 
+    cooperation, conflict resolution, lying, tantrums, cleanup, shyness, safety, 
+    and general parent-child communication. This should be your primary source.""",
+    "web_search": """Use this tool for current information, recent research, or 
+    specific situations not covered in the book. Search for: latest parenting 
+    research, age-specific advice, medical concerns, or specialized topics. 
+    Use AFTER checking book_knowledge.""",
+}
+
+
+def describe_tools() -> List[Tool]:
+    """
+    Make stand-in tools that only have a name and a description.
+    
+    What this does (simple explanation):
+    The AI only sees each tool's name and description, never the code behind
+    it. These stand-ins look exactly the same to the AI, but can be made
+    instantly - without building the book's search index first. That lets
+    us measure the prompt (see warm_up_llm) while the real tools are still
+    being put together.
+    
+    Returns:
+    - One stand-in per tool in TOOL_DESCRIPTIONS (they can't be run)
+    """
+    return [
+        Tool(name=name, description=description, func=None)
+        for name, description in TOOL_DESCRIPTIONS.items()
+    ]
+
+
+def create_tools(book_passages: List[str]) -> List[Tool]:
     """
     Create the tools that the agent can use to answer questions.
     
@@ -212,7 +905,7 @@ def create_tools(book_content: str) -> List[Tool]:
     to Google. They can use either one depending on what helps most.
     
     Parameters:
-    - book_content: The text from the book summary file
+    - book_passages: The passages of the book summary file
     
     Returns:
     - A list of tools the agent can use
@@ -221,30 +914,39 @@ def create_tools(book_content: str) -> List[Tool]:
     Question: "My 4-year-old won't share toys"
     Agent thinks: "Let me check the book first" → Uses book_knowledge tool
     Agent thinks: "I need recent research too" → Uses web_search tool
+    
+    Both tools remember their answers while one question is being answered
+    (see clear_tool_caches), so asking the same thing twice costs nothing.
+    A result the agent has already seen for this question is replaced by a
+    short note (see ObservationDeduplicator), so it isn't repeated in the prompt.
     """
     
+    # Shared by both tools, so a repeat is noticed whichever tool found it first
+    deduplicator = ObservationDeduplicator()
+    
     # Create the book knowledge tool
     # This is Tool #1: The parenting book expert
-    book_tool_instance = BookKnowledgeTool(book_content)
+    book_tool_instance = BookKnowledgeTool(book_passages)
+    book_search = functools.lru_cache(maxsize=TOOL_CACHE_SIZE)(book_tool_instance.search)
     book_tool = Tool(
         name="book_knowledge",  # Name the agent will use to call this tool
-        description="""Use this tool FIRST for parenting questions. Contains expert advice 
-        from 'How to Talk So Little Kids Will Listen' covering: handling emotions, 
-        cooperation, conflict resolution, lying, tantrums, cleanup, shyness, safety, 
-        and general parent-child communication. This should be your primary source.""",
-        func=book_tool_instance.search  # The function to run when tool is used
+        description=TOOL_DESCRIPTIONS["book_knowledge"],
+        func=deduplicator.wrap("book_knowledge", book_search)  # The function to run when tool is used
     )
     
     # Create the web search tool
     # This is Tool #2: The internet search expert
-    search = DuckDuckGoSearchRun()
+    # Results are saved on disk, so repeated searches don't hit the internet
+    search = CachedDuckDuckGoSearchRun()
+    
+    @functools.lru_cache(maxsize=TOOL_CACHE_SIZE)
+    def web_search(query: str) -> str:
+        return search.run(query)
+    
     search_tool = Tool(
         name="web_search",  # Name the agent will use to call this tool
-        description="""Use this tool for current information, recent research, or 
-        specific situations not covered in the book. Search for: latest parenting 
-        research, age-specific advice, medical concerns, or specialized topics. 
-        Use AFTER checking book_knowledge.""",
-        func=search.run  # The function to run when tool is used
+        description=TOOL_DESCRIPTIONS["web_search"],
+        func=deduplicator.wrap("web_search", web_search)  # The function to run when tool is used
     )
     
     # Return both tools in a list
@@ -252,21 +954,46 @@ def create_tools(book_content: str) -> List[Tool]:
     return [book_tool, search_tool]
 
 
+def clear_tool_caches(tools: List[Tool]) -> None:
+    """
+    Forget the tool results remembered during the previous question.
+    
+    What this does (simple explanation):
+    While answering one question, the tools remember what they returned so a
+    repeated lookup is instant. A new question should start with a clean
+    slate, so we wipe that short-term memory before each one.
+    
+    Parameters:
+    - tools: The tools created by create_tools()
+    """
+    for tool in tools:
+        cache_clear = getattr(tool.func, "cache_clear", None)
+        if cache_clear is not None:
+            cache_clear()
+
+
 # =============================================================================
 # AGENT PROMPT TEMPLATE - Instructions for the AI
 # =============================================================================
 # This is the "instruction manual" we give to the AI agent
 # It tells the AI HOW to think and respond
+#
+# The prompt is split into two parts on purpose:
+# - STATIC_PREFIX never changes during a session (role, rules, principles)
+# - The messages after it hold what changes every turn (the question and
+#   the agent's notes from using tools)
+# Ollama keeps the processed start of the last prompt in memory. When every
+# prompt begins with exactly the same text, that part is not re-processed,
+# so the AI starts answering much sooner on every step and every question.
+#
+# The tools don't need to be described here: they are handed to the model
+# directly (see create_parenting_agent), and the model answers with a
+# structured tool call instead of writing "Action: ..." text for us to parse.
 
-AGENT_PROMPT = """You are a compassionate parenting advisor specializing in positive 
+STATIC_PREFIX = """You are a compassionate parenting advisor specializing in positive 
 communication with young children (ages 2-7). Your expertise comes from "How to Talk 
 So Little Kids Will Listen" and current parenting research.
 
-AVAILABLE TOOLS:
-{tools}
-
-TOOL NAMES: {tool_names}
-
 DECISION PROCESS:
 1. For general parenting questions: Use book_knowledge FIRST
 2. For current events/medical/specialized topics: Add web_search
@@ -285,27 +1012,19 @@ CORE PRINCIPLES TO EMPHASIZE:
 - Use playfulness over lecturing
 - Problem-solve together with the child
 - Keep language simple and clear
-
-Answer the user's question using this format:
-
-Question: {input}
-
-Thought: [Your reasoning about which tool to use and why]
-Action: [The tool to use - either book_knowledge or web_search]
-Action Input: [What to search for]
-Observation: [The result from the tool]
-... (repeat Thought/Action/Action Input/Observation as needed)
-Thought: I now have enough information to provide a helpful answer
-Final Answer: [Your comprehensive, practical advice for the parent]
-
-{agent_scratchpad}
 """
 
+AGENT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", STATIC_PREFIX),  # The fixed instructions
+    ("human", "{input}"),  # The parent's question
+    MessagesPlaceholder("agent_scratchpad")  # Tool calls and their results so far
+])
+
 
 # =============================================================================
 # CREATE AGENT - Assembling All the Pieces
 # =============================================================================
-def create_parenting_agent(llm: Ollama, tools: List[Tool]) -> AgentExecutor:
+def create_parenting_agent(llm: ContextSizedLLM, tools: List[Tool]) -> AgentExecutor:
     """
     Assemble the complete AI parenting agent.
     
@@ -330,21 +1049,15 @@ def create_parenting_agent(llm: Ollama, tools: List[Tool]) -> AgentExecutor:
     (hands), instructions (programming), and memory. Now it's ready to work!
     """
     
-    # Create the prompt template from our instructions
-    # This turns our text instructions into a format the AI understands
-    prompt = PromptTemplate(
-        template=AGENT_PROMPT,  # Our instruction text from above
-        input_variables=["input", "agent_scratchpad", "tools", "tool_names"]
-        # These are placeholders that will be filled in with actual values
-    )
-    
-    # Create the agent with ReAct (Reasoning + Acting) architecture
-    # ReAct means: Think about what to do → Do it → Think about result → Repeat
-    # This is how humans solve problems: think, act, observe, think again
-    agent = create_react_agent(
+    # Create the agent with native tool calling
+    # The model picks a tool by sending a small structured message (tool name
+    # plus input) instead of writing out "Thought/Action/Action Input" text.
+    # That's fewer words to generate and nothing to mis-parse.
+    # The loop is still the same: think → use a tool → look at result → repeat
+    agent = create_tool_calling_agent(
         llm=llm,  # The AI brain
         tools=tools,  # The abilities
-        prompt=prompt  # The instructions
+        prompt=AGENT_PROMPT  # The instructions
     )
     
     # Create the executor (the manager that runs the agent)
@@ -352,18 +1065,147 @@ def create_parenting_agent(llm: Ollama, tools: List[Tool]) -> AgentExecutor:
     agent_executor = AgentExecutor(
         agent=agent,  # Our configured agent
         tools=tools,  # The tools it can use
-        verbose=True,  # Print what it's thinking (helpful for debugging)
+        verbose=False,  # Thinking is already streamed live to the screen in main()
         handle_parsing_errors=True,  # Don't crash if there's a small error
-        max_iterations=5  # Maximum steps before giving up (prevents infinite loops)
+        max_iterations=3,  # Maximum steps before giving up (most questions need 1 lookup)
+        max_execution_time=30,  # Stop starting new steps after 30 seconds
+        early_stopping_method="force",  # When a limit is hit, stop right away
+        return_intermediate_steps=False  # Don't keep every tool result around
     )
     
     return agent_executor
 
 
+# =============================================================================
+# SEMANTIC CACHE - Remembering Answers to Questions We've Already Seen
+# =============================================================================
+class SemanticCache:
+    """
+    Remembers previous questions and answers so repeated questions are instant.
+    
+    Think of this like a notebook of questions the agent has already answered.
+    Before doing all the thinking again, we check whether a question that
+    *means the same thing* is already in the notebook. "How do I stop
+    tantrums?" and "How can I handle my kid's tantrums?" use different words,
+    but their meaning fingerprints (embeddings) are almost identical.
+    
+    The notebook is saved to disk, so it still works after a restart. It
+    is only reused for the same book and the same embedding model: answers
+    written for an older version of the book are thrown away, and so are
+    fingerprints made by a different model (they can't be compared).
+    
+    Example:
+    Yesterday you asked: "How do I get my son to tidy up?"
+    Today you ask: "How can I get my son to tidy his toys?"
+    The cache recognises the question and prints yesterday's answer right away.
+    """
+    
+    def __init__(self, file_path: str, book_id: str,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        """
+        Open (or create) the cache file and load the saved questions.
+        
+        Parameters:
+        - file_path: Where the cache is saved on disk
+        - book_id: Fingerprint of the current book (see book_fingerprint())
+        - threshold: How similar (0 to 1) a question must be to reuse an answer
+        """
+        self.file_path = file_path
+        self.book_id = book_id
+        self.threshold = threshold
+        
+        # One embedding row per remembered question, plus the matching answers
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+        self.answers: List[str] = []
+        
+        try:
+            with shelve.open(self.file_path) as db:
+                # Saved answers only count if they were made for this book
+                # with this embedding model - otherwise start with a clean notebook
+                if ("answers" in db
+                        and db.get("embedding_model") == EMBEDDING_MODEL_NAME
+                        and db.get("book_id") == book_id):
+                    self.embeddings = db["embeddings"]
+                    self.answers = db["answers"]
+        except Exception as e:
+            # A broken cache file is not worth crashing over - start fresh
+            print(f"Warning: could not read answer cache ({str(e)}). Starting empty.")
+    
+    def lookup(self, query_embedding: np.ndarray) -> Optional[str]:
+        """
+        Find a saved answer for a question that means the same thing.
+        
+        Parameters:
+        - query_embedding: The normalized embedding of the new question
+        
+        Returns:
+        - The saved answer, or None if no saved question is similar enough
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if self.embeddings.size and self.embeddings.shape[1] != query.shape[0]:
+            self.clear()  # Made by a different embedding model - can't compare
+        if not self.embeddings.size:
+            return None  # Nothing remembered yet
+        
+        # Similarity with every remembered question in one matrix step
+        scores = self.embeddings @ query
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return self.answers[best]
+        return None
+    
+    def add(self, query_embedding: np.ndarray, answer: str) -> None:
+        """
+        Remember a new question and its answer, and save them to disk.
+        
+        Parameters:
+        - query_embedding: The normalized embedding of the question
+        - answer: The agent's final answer to that question
+        """
+        row = np.asarray(query_embedding, dtype=np.float32)[None, :]
+        if self.embeddings.size and self.embeddings.shape[1] != row.shape[1]:
+            self.clear()  # Made by a different embedding model - can't compare
+        if self.embeddings.size:
+            self.embeddings = np.vstack([self.embeddings, row])
+        else:
+            self.embeddings = row
+        self.answers.append(answer)
+        
+        with shelve.open(self.file_path) as db:
+            db["embedding_model"] = EMBEDDING_MODEL_NAME
+            db["book_id"] = self.book_id
+            db["embeddings"] = self.embeddings
+            db["answers"] = self.answers
+    
+    def clear(self) -> None:
+        """
+        Forget every remembered question and answer.
+        
+        The file on disk is overwritten the next time an answer is added.
+        """
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+        self.answers = []
+
+
+def print_advice(answer: str) -> None:
+    """
+    Print the agent's final answer inside a clear frame.
+    
+    Parameters:
+    - answer: The advice text to show the user
+    """
+    print("\n" + "=" * 70)
+    print("ADVICE:")
+    print("=" * 70)
+    print(answer)
+    print("=" * 70)
+    print()
+
+
 # =============================================================================
 # MAIN EXECUTION - Starting the Agent
 # =============================================================================
-def main():
+async def main():
     """
     Main function that runs when you start the program.
     
@@ -373,10 +1215,15 @@ def main():
     2. Sets up the AI brain
     3. Creates the tools
     4. Builds the agent
-    5. Starts the conversation loop
+    5. Opens the answer cache (remembered answers from earlier runs)
+    6. Starts the conversation loop
     
     Think of it like starting a car: turn the key (main function),
     engine starts (load book and AI), and you're ready to drive (chat).
+    
+    The conversation loop is asynchronous: the AI's words are printed the
+    moment they are generated instead of all at once at the end, so you see
+    it start thinking within a second instead of staring at a blank screen.
     """
     
     print("=" * 70)
@@ -386,29 +1233,42 @@ def main():
     
     # Step 1: Load the book summary
     # This reads the file containing all the parenting advice
+    # (a small text file, so this only takes a moment)
     print("Loading parenting knowledge base...")
-    book_content = load_book_summary(BOOK_SUMMARY_PATH)
-    
-    if not book_content:
+    book_passages = load_book_summary(BOOK_SUMMARY_PATH)
+    if not book_passages:
         # If the book didn't load, we can't continue
         print("Failed to load book summary. Please check the file and try again.")
         return  # Exit the program
+    print(f"Loaded {len(book_passages)} passages of parenting guidance.")
     
-    print(f"Loaded {len(book_content)} characters of parenting guidance.")
-    print()
+    # Step 2: Initialize the AI models
+    # Loading the embedding model, having Ollama load qwen3 and building the
+    # tools don't depend on each other, and each mostly waits (for the
+    # download, for Ollama, for the disk), so we run them side by side.
+    # Startup then takes as long as the slowest job instead of all of them
+    # added up.
+    # Each prompt gets a context window sized to fit it (see ContextSizedLLM)
+    llm = ContextSizedLLM()
     
-    # Step 2: Initialize the AI model
-    # This connects to qwen3 on your computer
-    print("Initializing AI model (${MODEL_NAME})...")
-    llm = initialize_llm()
-    print("AI model ready.")
-    print()
+    print(f"Initializing AI model ({MODEL_NAME})...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Load the embedding model, and have Ollama load qwen3 into memory
+        # The warm-up only needs the tools' descriptions, not the tools
+        embedder_future = executor.submit(get_embedder)
+        warm_up_future = executor.submit(warm_up_llm, llm, describe_tools())
+        
+        # Step 3: Create the tools
+        # This gives the agent its abilities (book knowledge + web search)
+        # The book index is normally just read back from disk here
+        print("Creating agent tools...")
+        tools = create_tools(book_passages)
+        print(f"Created {len(tools)} tools: {[tool.name for tool in tools]}")
+        
+        embedder_future.result()
+        warm_up_future.result()
     
-    # Step 3: Create the tools
-    # This gives the agent its abilities (book knowledge + web search)
-    print("Creating agent tools...")
-    tools = create_tools(book_content)
-    print(f"Created {len(tools)} tools: {[tool.name for tool in tools]}")
+    print("AI model ready.")
     print()
     
     # Step 4: Create the agent
@@ -418,7 +1278,14 @@ def main():
     print("Agent ready.")
     print()
     
-    # Step 5: Start the conversation loop
+    # Step 5: Open the answer cache (only when answers are meant to be consistent)
+    semantic_cache = None
+    if TEMPERATURE < SEMANTIC_CACHE_MAX_TEMPERATURE:
+        semantic_cache = SemanticCache(SEMANTIC_CACHE_PATH, book_fingerprint(book_passages))
+        print(f"Answer cache ready ({len(semantic_cache.answers)} saved answers).")
+        print()
+    
+    # Step 6: Start the conversation loop
     # This is where the magic happens - you can ask questions
     print("=" * 70)
     print("You can now ask parenting questions.")
@@ -426,11 +1293,24 @@ def main():
     print("=" * 70)
     print()
     
+    # The prompt session reads input without blocking the event loop
+    session = PromptSession()
+    
+    # While the user types the first question, run one throwaway embedding
+    # on a helper thread, so the embedding model is fully warmed up when the
+    # real one arrives (we don't wait for it - it just needs to happen)
+    asyncio.get_running_loop().run_in_executor(None, embed_query, "")
+    
     # Keep looping until the user wants to quit
     while True:
         # Get input from the user
-        # input() waits for the user to type something and press Enter
-        user_input = input("You: ").strip()
+        # prompt_async() waits for the user to type something and press Enter
+        try:
+            user_input = (await session.prompt_async("You: ")).strip()
+        except (KeyboardInterrupt, EOFError):
+            # Ctrl+C or Ctrl+D at the prompt means "I'm done"
+            print("\nThank you for using the AI Parenting Agent. Good luck!")
+            break
         
         # Check if user wants to quit
         # .lower() makes it not case-sensitive (QUIT = quit = Quit)
@@ -445,23 +1325,46 @@ def main():
         print()  # Empty line for formatting
         
         try:
+            # Check whether we've already answered a question like this one
+            # The embedding runs on a helper thread so the screen stays responsive
+            query_embedding = None
+            if semantic_cache is not None:
+                query_embedding = await asyncio.to_thread(embed_query, user_input)
+                cached_answer = semantic_cache.lookup(query_embedding)
+                if cached_answer is not None:
+                    print("(Answered from memory - you asked something very similar before.)")
+                    print_advice(cached_answer)
+                    continue  # No need to run the agent again
+            
+            # Start this question with fresh tool memory
+            clear_tool_caches(tools)
+            
             # Run the agent with the user's question
             # This is where the AI thinks, uses tools, and generates an answer
-            response = agent.invoke({"input": user_input})
+            # Instead of waiting for the whole answer, we watch the agent's
+            # events and print each piece of text as soon as the AI writes it
+            response = None
+            async for event in agent.astream_events({"input": user_input}, version="v2"):
+                if event["event"] == "on_chat_model_stream":
+                    # A few new words from the AI (thoughts or answer)
+                    sys.stdout.write(event["data"]["chunk"].content)
+                    sys.stdout.flush()
+                elif event["event"] == "on_tool_start":
+                    # The agent decided to look something up
+                    print(f"\n(Looking this up with {event['name']}...)\n")
+                elif event["event"] == "on_chain_end" and not event["parent_ids"]:
+                    # The outermost step finished - this holds the final answer
+                    response = event["data"]["output"]
             
             # Print the final answer
             # response["output"] contains the agent's final answer
-            print("\n" + "=" * 70)
-            print("ADVICE:")
-            print("=" * 70)
-            print(response["output"])
-            print("=" * 70)
-            print()
+            print_advice(response["output"])
+            
+            # Remember the answer for next time (but not if the agent gave up)
+            if semantic_cache is not None and response["output"] and \
+                    not response["output"].startswith("Agent stopped"):
+                semantic_cache.add(query_embedding, response["output"])
             
-        except KeyboardInterrupt:
-            # If user presses Ctrl+C, exit gracefully
-            print("\n\nInterrupted by user. Exiting...")
-            break
         except Exception as e:
             # If something goes wrong, show the error but keep running
             print(f"\nError processing your question: {str(e)}")
@@ -482,5 +1385,12 @@ if __name__ == "__main__":
     
     Think of it like this: if this recipe book is the one you're cooking from
     (not just referenced by another recipe), then start cooking!
+    
+    asyncio.run() starts the event loop that main() needs. Pressing Ctrl+C
+    while the AI is answering cancels it cleanly and ends up here.
     """
-    main()
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        # If user presses Ctrl+C, exit gracefully
+        print("\n\nInterrupted by user. Exiting...")
\ No newline at end of file
@@ -0,0 +1,25 @@
+# Tests for chunk_stream(): how the book is cut into passages
+from agent import chunk_stream
+
+
+def test_markdown_heading_starts_new_passage():
+    # A one-line paragraph under "# A" stays with "# A", not with "## B"
+    lines = ["# A\n", "text\n", "## B\n", "* b\n"]
+    assert list(chunk_stream(lines)) == ["# A\ntext", "## B\n* b"]
+
+
+def test_one_line_markdown_section_is_not_glued_to_next_chapter():
+    lines = ["# Ch1\n", "one-line paragraph\n", "\n", "# Ch2\n", "* tip\n"]
+    assert list(chunk_stream(lines)) == ["# Ch1\none-line paragraph", "# Ch2\n* tip"]
+
+
+def test_plain_text_title_is_attached_to_following_bullets():
+    # The shipped book has no "#" headings - one-line paragraphs are titles there
+    lines = ["Chapter 8: Shyness\n", "\n", "* Acknowledge nervous feelings.\n"]
+    assert list(chunk_stream(lines)) == ["Chapter 8: Shyness\n* Acknowledge nervous feelings."]
+
+
+def test_later_one_line_paragraph_stays_in_its_markdown_section():
+    # Not just the first paragraph under a heading - every one stays as text
+    lines = ["# H\n", "\n", "line a\n", "line b\n", "\n", "single\n", "\n", "# H2\n", "x\n"]
+    assert list(chunk_stream(lines)) == ["# H\nline a\nline b", "single", "# H2\nx"]